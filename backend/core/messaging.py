@@ -13,6 +13,11 @@ Channel: TypeAlias = AbstractRobustChannel
 
 _connection: Optional[AbstractRobustConnection] = None
 
+# Missing-patch reports emitted by the core diff engine
+PATCH_RESULTS_EXCHANGE = "patch_results_exchange"
+MISSING_PATCHES_QUEUE = "missing_patches_queue"
+MISSING_PATCHES_ROUTING_KEY = "missing_patches_routing_key"
+
 
 async def get_rabbitmq_connection() -> AbstractRobustConnection:
     """Gets or creates the global RabbitMQ connection."""
@@ -166,5 +171,13 @@ async def setup_messaing_infrastructure(channel: Channel):
     await bind_queue(
         channel, user_command_exchange, create_user_queue, create_user_routing_key
     )
+
+    await declare_exchange(
+        channel, PATCH_RESULTS_EXCHANGE, exchange_type="direct", durable=True
+    )
+    await declare_queue(channel, MISSING_PATCHES_QUEUE, durable=True)
+    await bind_queue(
+        channel, MISSING_PATCHES_QUEUE, PATCH_RESULTS_EXCHANGE, MISSING_PATCHES_ROUTING_KEY
+    )
     # Add declarations for other exchanges/queues
     print("Message infrastructure setup complete.")
@@ -0,0 +1,127 @@
+import argparse
+import io
+import json
+import os
+import random
+import time
+
+from .catalogue import PatchCatalogue
+from .engine import InventoryDiffEngine, diff_lines
+
+
+def generate_catalogue(
+    packages: int, advisories_per_package: int, rng: random.Random
+) -> list[dict]:
+    """Generates catalogue records for synthetic packages ``pkg-0`` .. ``pkg-N``."""
+    records = []
+    for index in range(packages):
+        for advisory in range(advisories_per_package):
+            records.append({
+                "patch_id": f"PSX-{index:05d}-{advisory}",
+                "package": f"pkg-{index}",
+                "fixed_version": f"{advisory + 1}.{rng.randint(0, 9)}.{rng.randint(0, 20)}",
+                "severity": rng.choice(("low", "medium", "high", "critical")),
+            })
+    return records
+
+
+def generate_inventories(
+    hosts: int, packages_per_host: int, package_pool: int, rng: random.Random
+) -> bytes:
+    """Generates an NDJSON stream of synthetic host inventories."""
+    buffer = io.StringIO()
+    for index in range(hosts):
+        names = rng.sample(range(package_pool), packages_per_host)
+        record = {
+            "host": f"host-{index:06d}",
+            "packages": [
+                {
+                    "name": f"pkg-{name}",
+                    "version": f"{rng.randint(0, 4)}.{rng.randint(0, 9)}.{rng.randint(0, 20)}",
+                }
+                for name in names
+            ],
+        }
+        buffer.write(json.dumps(record, separators=(",", ":")))
+        buffer.write("\n")
+    return buffer.getvalue().encode("utf-8")
+
+
+def _report(label: str, hosts: int, missing: int, elapsed: float, baseline: float):
+    rate = hosts / elapsed * 60 if elapsed else float("inf")
+    print(
+        f"{label:<12} {hosts} hosts, {missing} missing patches in {elapsed:.2f}s "
+        f"({rate:,.0f} hosts/min, {baseline / elapsed:.2f}x serial)"
+    )
+
+
+def run_serial(catalogue_records: list[dict], inventories: bytes) -> tuple[int, int]:
+    catalogue = PatchCatalogue.from_records(catalogue_records)
+    result = diff_lines(io.BytesIO(inventories), catalogue)
+    return result.hosts_scanned, len(result.advisory_ids)
+
+
+def run_pool(
+    catalogue_records: list[dict], inventories: bytes, workers: int, chunk_size: int
+) -> tuple[int, int]:
+    engine = InventoryDiffEngine(
+        catalogue_records, max_workers=workers, chunk_size=chunk_size
+    )
+    with engine:
+        missing = sum(
+            len(report.advisory_ids) for report in engine.run(io.BytesIO(inventories))
+        )
+    return engine.hosts_processed, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the patch diff engine on synthetic inventories."
+    )
+    parser.add_argument("--hosts", type=int, default=20000)
+    parser.add_argument("--packages-per-host", type=int, default=300)
+    parser.add_argument("--package-pool", type=int, default=5000)
+    parser.add_argument("--catalogue-packages", type=int, default=2000)
+    parser.add_argument("--advisories-per-package", type=int, default=3)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, os.cpu_count() or 1}),
+        help="Pool sizes to measure.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    catalogue_records = generate_catalogue(
+        args.catalogue_packages, args.advisories_per_package, rng
+    )
+    inventories = generate_inventories(
+        args.hosts, args.packages_per_host, args.package_pool, rng
+    )
+    print(
+        f"Generated {args.hosts} inventories ({len(inventories) / 1e6:.1f} MB) and "
+        f"{len(catalogue_records)} advisories in {time.perf_counter() - started:.2f}s "
+        f"on {os.cpu_count()} CPUs"
+    )
+
+    started = time.perf_counter()
+    hosts, missing = run_serial(catalogue_records, inventories)
+    baseline = time.perf_counter() - started
+    _report("serial", hosts, missing, baseline, baseline)
+
+    for workers in args.workers:
+        # Worker start-up and per-worker catalogue indexing are part of the measurement.
+        started = time.perf_counter()
+        hosts, missing = run_pool(
+            catalogue_records, inventories, workers, args.chunk_size
+        )
+        elapsed = time.perf_counter() - started
+        _report(f"pool[{workers}]", hosts, missing, elapsed, baseline)
+
+
+if __name__ == "__main__":
+    main()
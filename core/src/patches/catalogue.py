@@ -0,0 +1,90 @@
+import json
+from bisect import bisect_right
+from typing import Iterable, NamedTuple, Optional
+
+from .inventory import StringTable, VersionKey, parse_version_key
+
+
+class PatchAdvisory(NamedTuple):
+    """A patch that fixes a package from a given version onwards."""
+
+    patch_id: str
+    package: str
+    fixed_version: str
+    severity: Optional[str] = None
+
+
+class PatchCatalogue:
+    """
+    Index of available patches keyed by interned package name.
+
+    Advisories get a stable id in insertion order, so catalogues built from the
+    same records in different processes agree on every name and advisory id.
+    Per package, advisory ids are kept sorted by fixed version, so the patches a
+    host is missing are a single bisect away.
+    """
+
+    def __init__(self, names: Optional[StringTable] = None):
+        self.names = names if names is not None else StringTable()
+        self.advisories: list[PatchAdvisory] = []
+        self._keys: dict[int, list[VersionKey]] = {}
+        self._advisory_ids: dict[int, list[int]] = {}
+
+    def add(self, advisory: PatchAdvisory) -> int:
+        """Adds an advisory to the index and returns its id."""
+        advisory_id = len(self.advisories)
+        self.advisories.append(advisory)
+        name_id = self.names.intern(advisory.package)
+        fixed_key = parse_version_key(advisory.fixed_version)
+        keys = self._keys.setdefault(name_id, [])
+        advisory_ids = self._advisory_ids.setdefault(name_id, [])
+        position = bisect_right(keys, fixed_key)
+        keys.insert(position, fixed_key)
+        advisory_ids.insert(position, advisory_id)
+        return advisory_id
+
+    def missing(self, name_id: int, installed_key: VersionKey) -> list[int]:
+        """Returns the ids of advisories fixed in a version newer than the installed one."""
+        keys = self._keys.get(name_id)
+        if keys is None:
+            return []
+        position = bisect_right(keys, installed_key)
+        return self._advisory_ids[name_id][position:]
+
+    def __contains__(self, name_id: int) -> bool:
+        return name_id in self._keys
+
+    def __len__(self) -> int:
+        return len(self.advisories)
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[dict], names: Optional[StringTable] = None
+    ) -> "PatchCatalogue":
+        """Builds a catalogue from ``package``/``fixed_version``/``patch_id`` records."""
+        catalogue = cls(names)
+        for record in records:
+            try:
+                advisory = PatchAdvisory(
+                    patch_id=record["patch_id"],
+                    package=record["package"],
+                    fixed_version=record["fixed_version"],
+                    severity=record.get("severity"),
+                )
+                if not isinstance(advisory.package, str) or not isinstance(
+                    advisory.fixed_version, str
+                ):
+                    raise TypeError("package and fixed_version must be strings")
+            except (TypeError, KeyError, AttributeError) as e:
+                raise ValueError(f"Invalid catalogue record {record!r}: {e}")
+            catalogue.add(advisory)
+        return catalogue
+
+
+def load_catalogue_records(path: str) -> list[dict]:
+    """Loads catalogue records from a JSON array or NDJSON file."""
+    with open(path, "rb") as f:
+        content = f.read().strip()
+    if content.startswith(b"["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
@@ -0,0 +1,282 @@
+import asyncio
+import os
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (IO, AsyncIterator, Iterable, Iterator, NamedTuple,
+                    Optional, Sequence, Union)
+
+from .catalogue import PatchCatalogue
+from .inventory import (HostInventory, InventoryFormatError, VersionTable,
+                        iter_ndjson_lines, parse_inventory_line)
+
+
+class MissingPatch(NamedTuple):
+    """A patch that is available but not applied on a host."""
+
+    package: str
+    installed_version: str
+    fixed_version: str
+    patch_id: str
+    severity: Optional[str] = None
+
+
+class HostPatchReport(NamedTuple):
+    """
+    Diff result for a single host.
+    ``advisory_ids`` index ``PatchCatalogue.advisories``; ``installed_versions``
+    holds the host's version of the package for each of them.
+    """
+
+    host: str
+    packages_scanned: int
+    advisory_ids: Sequence[int]
+    installed_versions: Sequence[str]
+
+
+class ChunkResult(NamedTuple):
+    """
+    Column-oriented reports for one chunk of inventory lines.
+
+    Workers return this instead of one object per host so that results cross the
+    process boundary as a few flat arrays and lists. ``offsets[i]:offsets[i + 1]``
+    is the slice of ``advisory_ids``/``installed_versions`` belonging to host ``i``.
+    """
+
+    hosts: list[str]
+    packages_scanned: array
+    offsets: array
+    advisory_ids: array
+    installed_versions: list[str]
+    hosts_scanned: int
+    malformed: int
+
+    def reports(self) -> Iterator[HostPatchReport]:
+        offsets = self.offsets
+        for index, host in enumerate(self.hosts):
+            start, end = offsets[index], offsets[index + 1]
+            yield HostPatchReport(
+                host,
+                self.packages_scanned[index],
+                self.advisory_ids[start:end],
+                self.installed_versions[start:end],
+            )
+
+
+def _collect_missing(
+    inventory: HostInventory,
+    catalogue: PatchCatalogue,
+    versions: VersionTable,
+    advisory_ids: array,
+    installed_versions: list[str],
+):
+    missing = catalogue.missing
+    for name_id, version_id in zip(inventory.names, inventory.versions):
+        found = missing(name_id, versions.key(version_id))
+        if found:
+            advisory_ids.extend(found)
+            installed_versions.extend([versions.lookup(version_id)] * len(found))
+
+
+def diff_host(
+    inventory: HostInventory, catalogue: PatchCatalogue, versions: VersionTable
+) -> HostPatchReport:
+    """Diffs a host inventory against the catalogue."""
+    advisory_ids = array("I")
+    installed_versions: list[str] = []
+    _collect_missing(inventory, catalogue, versions, advisory_ids, installed_versions)
+    return HostPatchReport(
+        inventory.host, inventory.package_count, advisory_ids, installed_versions
+    )
+
+
+def diff_lines(
+    lines: Iterable[Union[str, bytes]],
+    catalogue: PatchCatalogue,
+    only_missing: bool = True,
+) -> ChunkResult:
+    """
+    Parses and diffs a batch of NDJSON inventory lines.
+
+    Versions are interned into a table that lives only for this batch, and package
+    names are looked up in the catalogue without being added, so repeated calls
+    do not grow any long-lived state. With ``only_missing`` fully patched hosts
+    are counted but left out of the result.
+    """
+    versions = VersionTable()
+    hosts: list[str] = []
+    packages_scanned = array("I")
+    offsets = array("I", [0])
+    advisory_ids = array("I")
+    installed_versions: list[str] = []
+    hosts_scanned = 0
+    malformed = 0
+    for line in lines:
+        try:
+            inventory = parse_inventory_line(line, catalogue.names, versions)
+        except InventoryFormatError as e:
+            print(f"Skipping inventory record: {e}")
+            malformed += 1
+            continue
+        hosts_scanned += 1
+        _collect_missing(
+            inventory, catalogue, versions, advisory_ids, installed_versions
+        )
+        if only_missing and len(advisory_ids) == offsets[-1]:
+            continue
+        hosts.append(inventory.host)
+        packages_scanned.append(inventory.package_count)
+        offsets.append(len(advisory_ids))
+    return ChunkResult(
+        hosts,
+        packages_scanned,
+        offsets,
+        advisory_ids,
+        installed_versions,
+        hosts_scanned,
+        malformed,
+    )
+
+
+def missing_patches(
+    report: HostPatchReport, catalogue: PatchCatalogue
+) -> list[MissingPatch]:
+    """Expands a report's advisory ids into MissingPatch records."""
+    advisories = catalogue.advisories
+    missing = []
+    for advisory_id, installed_version in zip(
+        report.advisory_ids, report.installed_versions
+    ):
+        advisory = advisories[advisory_id]
+        missing.append(
+            MissingPatch(
+                package=advisory.package,
+                installed_version=installed_version,
+                fixed_version=advisory.fixed_version,
+                patch_id=advisory.patch_id,
+                severity=advisory.severity,
+            )
+        )
+    return missing
+
+
+# --- Worker process state ---
+
+_worker_catalogue: Optional[PatchCatalogue] = None
+
+
+def _init_worker(catalogue_records: list[dict]):
+    """Builds the catalogue index once per worker process."""
+    global _worker_catalogue
+    _worker_catalogue = PatchCatalogue.from_records(catalogue_records)
+
+
+def _diff_chunk(lines: list[Union[str, bytes]], only_missing: bool) -> ChunkResult:
+    return diff_lines(lines, _worker_catalogue, only_missing)
+
+
+class InventoryDiffEngine:
+    """
+    Diffs streamed NDJSON host inventories against a patch catalogue using a
+    process pool.
+
+    Lines are shipped to workers in chunks and only a bounded number of chunks
+    are in flight, so arbitrarily large streams are processed in constant memory.
+    Reports are yielded in input order. ``catalogue`` is the parent's copy of the
+    index, used to expand advisory ids with ``missing_patches``.
+    """
+
+    def __init__(
+        self,
+        catalogue_records: list[dict],
+        max_workers: Optional[int] = None,
+        chunk_size: int = 512,
+        max_pending_chunks: Optional[int] = None,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.catalogue_records = catalogue_records
+        self.catalogue = PatchCatalogue.from_records(catalogue_records)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks or self.max_workers * 2
+        self.hosts_processed = 0
+        self.malformed_records = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """Starts the worker pool."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.catalogue_records,),
+            )
+
+    def close(self):
+        """Shuts the worker pool down."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> "InventoryDiffEngine":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _chunks(self, stream: Union[IO, Iterable]) -> Iterator[list]:
+        chunk = []
+        for line in iter_ndjson_lines(stream):
+            chunk.append(line)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _submit(self, chunk: list, only_missing: bool) -> Future:
+        return self._executor.submit(_diff_chunk, chunk, only_missing)
+
+    def _collect(self, result: ChunkResult) -> Iterator[HostPatchReport]:
+        self.hosts_processed += result.hosts_scanned
+        self.malformed_records += result.malformed
+        return result.reports()
+
+    def run(
+        self, stream: Union[IO, Iterable], only_missing: bool = True
+    ) -> Iterator[HostPatchReport]:
+        """
+        Yields a report per host in the stream.
+        With ``only_missing`` hosts that are fully patched are counted but not yielded.
+        """
+        self.start()
+        pending: deque[Future] = deque()
+        for chunk in self._chunks(stream):
+            if len(pending) >= self.max_pending_chunks:
+                yield from self._collect(pending.popleft().result())
+            pending.append(self._submit(chunk, only_missing))
+        while pending:
+            yield from self._collect(pending.popleft().result())
+
+    async def arun(
+        self, stream: Union[IO, Iterable], only_missing: bool = True
+    ) -> AsyncIterator[HostPatchReport]:
+        """
+        Async variant of ``run`` that awaits worker results instead of blocking,
+        so it can share an event loop with the messaging connection.
+        Lines are still read from ``stream`` synchronously between awaits.
+        """
+        self.start()
+        pending: deque[Future] = deque()
+        for chunk in self._chunks(stream):
+            if len(pending) >= self.max_pending_chunks:
+                result = await asyncio.wrap_future(pending.popleft())
+                for report in self._collect(result):
+                    yield report
+            pending.append(self._submit(chunk, only_missing))
+        while pending:
+            result = await asyncio.wrap_future(pending.popleft())
+            for report in self._collect(result):
+                yield report
@@ -0,0 +1,201 @@
+import json
+import re
+from array import array
+from typing import IO, Iterable, Iterator, Union
+
+_VERSION_SEGMENT = re.compile(r"(\D*)(\d*)")
+
+
+class InventoryFormatError(ValueError):
+    """Raise when an inventory line cannot be parsed."""
+
+    def __init__(self, message: str = "Malformed inventory record."):
+        self.message = message
+        super().__init__(self.message)
+
+
+# Alphabetic suffixes that mark a pre-release when they directly follow a number,
+# e.g. ``2.0rc1``. They are compared as if written ``2.0~rc1``.
+PRE_RELEASE_TAGS = ("alpha", "beta", "pre", "rc")
+
+VersionPart = tuple[tuple[tuple[int, ...], int], ...]
+VersionKey = tuple[int, VersionPart, VersionPart]
+
+# Sentinel closing every part: equal to an absent segment in dpkg's comparison.
+_END_SEGMENT = ((0,), 0)
+
+
+def _char_order(char: str) -> int:
+    """Sort weight of a non-digit character, as in dpkg's ``order()``."""
+    if char == "~":
+        return -1
+    if char.isalpha():
+        return ord(char)
+    return ord(char) + 256
+
+
+def _part_key(part: str) -> VersionPart:
+    segments = []
+    for text, digits in _VERSION_SEGMENT.findall(part):
+        if not text and not digits:
+            continue
+        if segments and text.lower().startswith(PRE_RELEASE_TAGS):
+            text = "~" + text
+        # A trailing 0 weight stands for the end of the text, so shorter runs sort
+        # first unless the longer one continues with ``~``.
+        segments.append(
+            (tuple(_char_order(char) for char in text) + (0,), int(digits or 0))
+        )
+    segments.append(_END_SEGMENT)
+    return tuple(segments)
+
+
+def parse_version_key(version: str) -> VersionKey:
+    """
+    Build a sortable key for a package version string, following dpkg ordering.
+
+    ``[epoch:]upstream[-revision]``: epochs compare numerically, then upstream,
+    then revision. Digit runs compare as integers and ``~`` sorts before
+    everything, including the end of the string, so ``3.0.2~rc1 < 3.0.2``.
+    ``alpha``/``beta``/``pre``/``rc`` after a number are treated as pre-releases.
+    A missing revision sorts before any revision: ``1.0 < 1.0-1 < 1.0.1``.
+    """
+    epoch = 0
+    head, sep, rest = version.partition(":")
+    if sep and head.isdigit():
+        epoch = int(head)
+        version = rest
+    upstream, sep, revision = version.rpartition("-")
+    if not sep:
+        upstream, revision = revision, ""
+    return epoch, _part_key(upstream), _part_key(revision)
+
+
+class StringTable:
+    """
+    Interns strings into dense integer ids.
+    Inventories store ids in arrays instead of holding one str per row.
+    """
+
+    __slots__ = ("_ids", "_values")
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._values: list[str] = []
+
+    def intern(self, value: str) -> int:
+        """Returns the id for a value, adding it to the table if needed."""
+        ident = self._ids.get(value)
+        if ident is None:
+            ident = len(self._values)
+            self._ids[value] = ident
+            self._values.append(value)
+        return ident
+
+    def get(self, value: str) -> int | None:
+        """Returns the id for a value without adding it."""
+        return self._ids.get(value)
+
+    def lookup(self, ident: int) -> str:
+        """Returns the value stored under an id."""
+        return self._values[ident]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class VersionTable(StringTable):
+    """StringTable that also caches the parsed sort key of every version."""
+
+    __slots__ = ("_keys",)
+
+    def __init__(self):
+        super().__init__()
+        self._keys: list[VersionKey] = []
+
+    def intern(self, value: str) -> int:
+        ident = self._ids.get(value)
+        if ident is None:
+            ident = super().intern(value)
+            self._keys.append(parse_version_key(value))
+        return ident
+
+    def key(self, ident: int) -> VersionKey:
+        """Returns the cached sort key for a version id."""
+        return self._keys[ident]
+
+
+class HostInventory:
+    """
+    Catalogued packages installed on a single host.
+
+    Package names and versions are kept as parallel arrays of interned ids;
+    ``package_count`` also includes the packages the catalogue knows nothing about.
+    """
+
+    __slots__ = ("host", "package_count", "names", "versions")
+
+    def __init__(self, host: str, package_count: int, names: array, versions: array):
+        self.host = host
+        self.package_count = package_count
+        self.names = names
+        self.versions = versions
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self):
+        return f"<HostInventory(host={self.host}, packages={self.package_count})>"
+
+
+def parse_inventory_line(
+    line: Union[str, bytes],
+    names: StringTable,
+    versions: VersionTable,
+) -> HostInventory:
+    """
+    Parses one NDJSON inventory record into a HostInventory.
+
+    ``names`` is only looked up, never extended: packages it does not contain are
+    counted and dropped, so long-lived tables stay the size of the catalogue.
+
+    Expected shape:
+    ``{"host": "web-01", "packages": [{"name": "openssl", "version": "3.0.2"}]}``
+    """
+    try:
+        record = json.loads(line)
+        host = record["host"]
+        packages = record["packages"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InventoryFormatError(f"Malformed inventory record: {e}")
+    if not isinstance(host, str) or not isinstance(packages, list):
+        raise InventoryFormatError("Inventory record must have a host and packages.")
+
+    name_ids = array("I")
+    version_ids = array("I")
+    lookup_name = names.get
+    intern_version = versions.intern
+    try:
+        for package in packages:
+            name = package["name"]
+            version = package["version"]
+            if not isinstance(name, str) or not isinstance(version, str):
+                raise InventoryFormatError(
+                    f"Package name and version must be strings for {host}: {package!r}"
+                )
+            name_id = lookup_name(name)
+            if name_id is None:
+                continue
+            name_ids.append(name_id)
+            version_ids.append(intern_version(version))
+    except (TypeError, KeyError) as e:
+        raise InventoryFormatError(f"Malformed package entry for {host}: {e}")
+    return HostInventory(host, len(packages), name_ids, version_ids)
+
+
+def iter_ndjson_lines(stream: Union[IO, Iterable]) -> Iterator[Union[str, bytes]]:
+    """Yields the non-blank lines of an NDJSON stream without buffering it."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
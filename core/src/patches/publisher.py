@@ -0,0 +1,122 @@
+# Publishes missing-patch reports through the backend's ``core.messaging`` helpers.
+# Install the ``messaging`` extra and put the backend on the path, e.g. from core/:
+#   PYTHONPATH=../backend python -m src.patches.publisher inventories.ndjson catalogue.json
+import argparse
+import asyncio
+import json
+from typing import IO, Iterable, Union
+
+from core.messaging import (MISSING_PATCHES_QUEUE, MISSING_PATCHES_ROUTING_KEY,
+                            PATCH_RESULTS_EXCHANGE, Channel, bind_queue,
+                            close_rabbitmq_connection, declare_exchange,
+                            declare_queue, get_rabbitmq_connection,
+                            publish_message)
+
+from .catalogue import PatchCatalogue, load_catalogue_records
+from .engine import HostPatchReport, InventoryDiffEngine, missing_patches
+
+
+def serialize_report_batch(
+    batch: list[HostPatchReport], catalogue: PatchCatalogue
+) -> bytes:
+    """Serializes a batch of reports into a JSON message body."""
+    return json.dumps(
+        {
+            "hosts": [
+                {
+                    "host": report.host,
+                    "packages_scanned": report.packages_scanned,
+                    "missing": [
+                        patch._asdict() for patch in missing_patches(report, catalogue)
+                    ],
+                }
+                for report in batch
+            ]
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+async def publish_missing_patches(
+    channel: Channel,
+    engine: InventoryDiffEngine,
+    stream: Union[IO, Iterable],
+    batch_size: int = 500,
+) -> int:
+    """
+    Diffs an inventory stream and publishes reports in batches as workers finish.
+
+    Worker results are awaited with ``engine.arun``, so the event loop (and the
+    connection's heartbeats) keep running while the pool is busy.
+    Returns the number of messages published.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+    await declare_exchange(
+        channel, PATCH_RESULTS_EXCHANGE, exchange_type="direct", durable=True
+    )
+    await declare_queue(channel, MISSING_PATCHES_QUEUE, durable=True)
+    await bind_queue(
+        channel, MISSING_PATCHES_QUEUE, PATCH_RESULTS_EXCHANGE, MISSING_PATCHES_ROUTING_KEY
+    )
+
+    published = 0
+    batch: list[HostPatchReport] = []
+    async for report in engine.arun(stream):
+        batch.append(report)
+        if len(batch) >= batch_size:
+            await _publish_batch(channel, batch, engine.catalogue)
+            published += 1
+            batch = []
+    if batch:
+        await _publish_batch(channel, batch, engine.catalogue)
+        published += 1
+    return published
+
+
+async def _publish_batch(
+    channel: Channel, batch: list[HostPatchReport], catalogue: PatchCatalogue
+):
+    await publish_message(
+        channel,
+        PATCH_RESULTS_EXCHANGE,
+        MISSING_PATCHES_ROUTING_KEY,
+        serialize_report_batch(batch, catalogue),
+    )
+
+
+async def _main(args: argparse.Namespace):
+    engine = InventoryDiffEngine(
+        load_catalogue_records(args.catalogue),
+        max_workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    connection = await get_rabbitmq_connection()
+    try:
+        channel = await connection.channel()
+        with engine, open(args.inventories, "rb") as stream:
+            published = await publish_missing_patches(
+                channel, engine, stream, args.batch_size
+            )
+        print(
+            f"Published {published} batches for {engine.hosts_processed} hosts "
+            f"({engine.malformed_records} malformed records skipped)."
+        )
+    finally:
+        await close_rabbitmq_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Diff NDJSON host inventories and publish missing patches."
+    )
+    parser.add_argument("inventories", help="NDJSON file with one host per line.")
+    parser.add_argument("catalogue", help="JSON or NDJSON patch catalogue.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=500)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
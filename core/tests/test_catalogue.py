@@ -0,0 +1,70 @@
+import pytest
+
+from src.patches.catalogue import PatchCatalogue
+from src.patches.inventory import StringTable, parse_version_key
+
+RECORDS = [
+    {"patch_id": "PSX-3", "package": "openssl", "fixed_version": "3.0.8"},
+    {"patch_id": "PSX-1", "package": "openssl", "fixed_version": "3.0.2"},
+    {"patch_id": "PSX-2", "package": "openssl", "fixed_version": "3.0.5"},
+    {"patch_id": "PSX-4", "package": "bash", "fixed_version": "5.2-1"},
+]
+
+
+def _missing(catalogue: PatchCatalogue, package: str, version: str) -> list[str]:
+    name_id = catalogue.names.get(package)
+    return [
+        catalogue.advisories[advisory_id].patch_id
+        for advisory_id in catalogue.missing(name_id, parse_version_key(version))
+    ]
+
+
+def test_installed_version_equal_to_fix_is_patched():
+    catalogue = PatchCatalogue.from_records(RECORDS)
+    assert _missing(catalogue, "openssl", "3.0.8") == []
+    assert _missing(catalogue, "bash", "5.2-1") == []
+
+
+def test_returns_every_newer_advisory_in_version_order():
+    catalogue = PatchCatalogue.from_records(RECORDS)
+    assert _missing(catalogue, "openssl", "3.0.1") == ["PSX-1", "PSX-2", "PSX-3"]
+    assert _missing(catalogue, "openssl", "3.0.2") == ["PSX-2", "PSX-3"]
+    assert _missing(catalogue, "openssl", "3.0.6") == ["PSX-3"]
+
+
+def test_pre_release_of_fixed_version_is_missing_the_fix():
+    catalogue = PatchCatalogue.from_records(RECORDS)
+    assert _missing(catalogue, "openssl", "3.0.2~rc1") == ["PSX-1", "PSX-2", "PSX-3"]
+    assert _missing(catalogue, "bash", "5.2") == ["PSX-4"]
+
+
+def test_unknown_package_has_no_advisories():
+    catalogue = PatchCatalogue.from_records(RECORDS)
+    assert catalogue.missing(len(catalogue.names), parse_version_key("1.0")) == []
+
+
+def test_advisory_ids_follow_record_order():
+    catalogue = PatchCatalogue.from_records(RECORDS)
+    assert [advisory.patch_id for advisory in catalogue.advisories] == [
+        record["patch_id"] for record in RECORDS
+    ]
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"patch_id": "PSX-5", "package": "openssl"},
+        {"patch_id": "PSX-5", "package": "openssl", "fixed_version": None},
+        {"patch_id": "PSX-5", "package": "openssl", "fixed_version": 3},
+        {"patch_id": "PSX-5", "package": None, "fixed_version": "3.0.2"},
+        "not a record",
+    ],
+)
+def test_invalid_records_raise_value_error(record):
+    with pytest.raises(ValueError, match="Invalid catalogue record"):
+        PatchCatalogue.from_records([record])
+
+
+def test_uses_the_given_names_table_even_when_empty():
+    names = StringTable()
+    assert PatchCatalogue(names).names is names
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+from src.patches.catalogue import PatchCatalogue
+from src.patches.engine import (InventoryDiffEngine, MissingPatch, diff_lines,
+                                missing_patches)
+
+RECORDS = [
+    {
+        "patch_id": "PSX-1",
+        "package": "openssl",
+        "fixed_version": "3.0.2",
+        "severity": "high",
+    },
+]
+
+
+def _line(host: str, version: str, extra: str = "left-pad") -> str:
+    return json.dumps({
+        "host": host,
+        "packages": [
+            {"name": "openssl", "version": version},
+            {"name": extra, "version": "1.0"},
+        ],
+    })
+
+
+def test_diff_lines_counts_malformed_records():
+    catalogue = PatchCatalogue.from_records(RECORDS)
+    lines = [
+        _line("web-01", "3.0.1"),
+        "not json",
+        '{"host": "web-02"}',
+        '{"host": "web-04", "packages": [{"name": "openssl", "version": null}]}',
+        _line("web-03", "3.0.2"),
+    ]
+
+    result = diff_lines(lines, catalogue)
+
+    assert result.malformed == 3
+    assert result.hosts_scanned == 2
+    assert result.hosts == ["web-01"]
+
+
+def test_diff_lines_keeps_patched_hosts_when_asked():
+    catalogue = PatchCatalogue.from_records(RECORDS)
+    lines = [_line("web-01", "3.0.1"), _line("web-02", "3.0.2")]
+
+    reports = list(diff_lines(lines, catalogue, only_missing=False).reports())
+
+    assert [report.host for report in reports] == ["web-01", "web-02"]
+    assert [len(report.advisory_ids) for report in reports] == [1, 0]
+    assert missing_patches(reports[0], catalogue) == [
+        MissingPatch("openssl", "3.0.1", "3.0.2", "PSX-1", "high")
+    ]
+
+
+def test_diff_lines_does_not_grow_catalogue_names():
+    catalogue = PatchCatalogue.from_records(RECORDS)
+    lines = [_line(f"host-{i}", "3.0.1", extra=f"pkg-{i}") for i in range(100)]
+
+    diff_lines(lines, catalogue)
+
+    assert len(catalogue.names) == 1
+
+
+def test_run_yields_reports_in_input_order():
+    lines = [_line(f"host-{i:03d}", "3.0.1") for i in range(50)]
+    lines.insert(10, "not json")
+    lines.insert(
+        20, '{"host": "bad", "packages": [{"name": "openssl", "version": 3}]}'
+    )
+
+    with InventoryDiffEngine(RECORDS, max_workers=2, chunk_size=3) as engine:
+        hosts = [report.host for report in engine.run(lines)]
+
+    assert hosts == [f"host-{i:03d}" for i in range(50)]
+    assert engine.hosts_processed == 50
+    assert engine.malformed_records == 2
+
+
+def test_arun_matches_run():
+    lines = [_line(f"host-{i:03d}", "3.0.1" if i % 2 else "3.0.2") for i in range(20)]
+
+    async def collect(engine):
+        return [report async for report in engine.arun(lines)]
+
+    with InventoryDiffEngine(RECORDS, max_workers=2, chunk_size=4) as engine:
+        reports = asyncio.run(collect(engine))
+
+    assert [report.host for report in reports] == [
+        f"host-{i:03d}" for i in range(1, 20, 2)
+    ]
+    assert all(
+        missing_patches(report, engine.catalogue)[0].patch_id == "PSX-1"
+        for report in reports
+    )
@@ -0,0 +1,74 @@
+import pytest
+
+from src.patches.inventory import (InventoryFormatError, StringTable,
+                                   VersionTable, parse_inventory_line,
+                                   parse_version_key)
+
+
+@pytest.mark.parametrize(
+    "older, newer",
+    [
+        ("1.9", "1.10"),
+        ("2.0rc1", "2.0"),
+        ("2.0beta2", "2.0rc1"),
+        ("1.0.0alpha", "1.0.0"),
+        ("3.0.2~rc1", "3.0.2"),
+        ("1.0~rc1~1", "1.0~rc1"),
+        ("1.0", "1.0-1"),
+        ("1.0-1", "1.0-2"),
+        ("1.0-2", "1.0.1"),
+        ("1.0-1ubuntu1", "1.0-2"),
+        ("1.1.1", "1.1.1w"),
+        ("1.1.1a", "1.1.1b"),
+        ("9.9", "1:0.1"),
+        ("1.0", "1.0.0"),
+        ("1.0", "1.0+dfsg"),
+    ],
+)
+def test_version_ordering(older, newer):
+    assert parse_version_key(older) < parse_version_key(newer)
+
+
+@pytest.mark.parametrize("a, b", [("1.0", "01.00"), ("0:1.0", "1.0")])
+def test_equivalent_versions(a, b):
+    assert parse_version_key(a) == parse_version_key(b)
+
+
+def test_parse_inventory_skips_unknown_packages_without_interning():
+    names = StringTable()
+    openssl = names.intern("openssl")
+    versions = VersionTable()
+
+    inventory = parse_inventory_line(
+        '{"host": "web-01", "packages": ['
+        '{"name": "openssl", "version": "3.0.2"},'
+        '{"name": "left-pad", "version": "1.0"}]}',
+        names,
+        versions,
+    )
+
+    assert inventory.host == "web-01"
+    assert inventory.package_count == 2
+    assert list(inventory.names) == [openssl]
+    assert versions.lookup(inventory.versions[0]) == "3.0.2"
+    assert len(names) == 1
+    assert len(versions) == 1
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "not json",
+        '{"packages": []}',
+        '{"host": "web-01", "packages": {}}',
+        '{"host": "web-01", "packages": [{"name": "openssl"}]}',
+        '{"host": "web-01", "packages": [{"name": "openssl", "version": null}]}',
+        '{"host": "web-01", "packages": [{"name": "openssl", "version": 3}]}',
+        '{"host": "web-01", "packages": [{"name": 7, "version": "1.0"}]}',
+    ],
+)
+def test_parse_inventory_rejects_malformed_lines(line):
+    names = StringTable()
+    names.intern("openssl")
+    with pytest.raises(InventoryFormatError):
+        parse_inventory_line(line, names, VersionTable())
@@ -0,0 +1,239 @@
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Any, AsyncIterator, NamedTuple, Optional
+
+import httpx
+
+API_BASE_URL = os.getenv("PATCHSENTRYX_API_URL", "http://localhost:8000")
+USERS_PATH = "/users"
+
+CacheKey = tuple[Optional[str], str, tuple[tuple[str, str], ...]]
+
+
+class ApiError(Exception):
+    """Raise when the backend answers with an unexpected status."""
+
+    def __init__(self, status_code: int, message: str = "Backend request failed."):
+        self.status_code = status_code
+        self.message = message
+        super().__init__(f"{status_code}: {self.message}")
+
+
+class CachedResponse(NamedTuple):
+    """A cached GET body together with the ETag used to revalidate it."""
+
+    etag: str
+    data: Any
+
+
+def _cache_key(
+    authorization: Optional[str], path: str, params: Optional[dict]
+) -> CacheKey:
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return authorization, path, items
+
+
+class ApiClient:
+    """
+    Shared async client for the PatchSentryx backend.
+
+    Keeps a keep-alive connection pool open for the lifetime of the app,
+    coalesces identical in-flight GETs into one request, and revalidates cached
+    GET responses with ``If-None-Match`` so unchanged data costs a 304.
+    """
+
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        cache_size: int = 256,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+        self._cache: OrderedDict[CacheKey, CachedResponse] = OrderedDict()
+        self._cache_size = cache_size
+        self._inflight: dict[CacheKey, asyncio.Task] = {}
+
+    def set_token(self, token: Optional[str]):
+        """
+        Sets or clears the bearer token sent with every request.
+        Cached responses belong to the previous user and are dropped.
+        """
+        self._cache.clear()
+        self._inflight.clear()
+        if token:
+            self._client.headers["Authorization"] = f"Bearer {token}"
+        else:
+            self._client.headers.pop("Authorization", None)
+
+    async def get_json(self, path: str, params: Optional[dict] = None) -> Any:
+        """
+        GETs a JSON resource.
+        Concurrent calls for the same path and params share a single request.
+        """
+        # Keyed by credentials too, so a request started under a previous token
+        # is never shared with (or cached for) the next user.
+        key = _cache_key(self._client.headers.get("Authorization"), path, params)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, path, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        # Shield so one caller being cancelled does not cancel the shared request.
+        return await asyncio.shield(task)
+
+    def _forget_inflight(self, key: CacheKey, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every waiter was cancelled.
+            task.exception()
+
+    async def _fetch(self, key: CacheKey, path: str, params: Optional[dict]) -> Any:
+        authorization = key[0]
+        cached = self._cache.get(key)
+        # Send the credentials the key was built with, not whatever is set by now.
+        headers = {"Authorization": authorization} if authorization else {}
+        if cached:
+            headers["If-None-Match"] = cached.etag
+        response = await self._client.get(path, params=params, headers=headers)
+
+        if response.status_code == 304 and cached:
+            self._cache.move_to_end(key)
+            return cached.data
+        if response.status_code != 200:
+            raise ApiError(response.status_code, response.text)
+
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if etag and authorization == self._client.headers.get("Authorization"):
+            self._store(key, CachedResponse(etag, data))
+        else:
+            self._cache.pop(key, None)
+        return data
+
+    def _store(self, key: CacheKey, entry: CachedResponse):
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, path_prefix: str = "/"):
+        """Drops cached responses whose path starts with ``path_prefix``."""
+        for key in [key for key in self._cache if key[1].startswith(path_prefix)]:
+            del self._cache[key]
+
+    async def send_json(
+        self, method: str, path: str, payload: Optional[dict] = None
+    ) -> Any:
+        """
+        Sends a write request and invalidates cached reads of the same collection.
+        """
+        response = await self._client.request(method, path, json=payload)
+        collection = "/" + path.strip("/").split("/", 1)[0]
+        self.invalidate(collection)
+        if response.status_code >= 400:
+            raise ApiError(response.status_code, response.text)
+        if response.status_code == 204 or not response.content:
+            return None
+        return response.json()
+
+    # --- Users ---
+
+    async def list_users(self, offset: int = 0, limit: int = 50) -> list[dict]:
+        """Fetches one page of users."""
+        return await self.get_json(USERS_PATH, {"offset": offset, "limit": limit})
+
+    async def iter_user_pages(self, page_size: int = 50) -> AsyncIterator[list[dict]]:
+        """Yields pages of users until the backend returns a short page."""
+        offset = 0
+        while True:
+            page = await self.list_users(offset, page_size)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            offset += len(page)
+
+    async def close(self):
+        """Closes the connection pool."""
+        await self._client.aclose()
+
+
+class PagedLoader:
+    """
+    Incrementally loads a paged collection for a virtualized list view.
+
+    The view calls ``load_next`` as the user scrolls near the end and appends the
+    returned items; already-loaded pages are refreshed with ``refresh``, which
+    costs one 304 per unchanged page.
+    """
+
+    def __init__(self, client: ApiClient, path: str, page_size: int = 50):
+        self.client = client
+        self.path = path
+        self.page_size = page_size
+        self.items: list[dict] = []
+        self.has_more = True
+        self._lock = asyncio.Lock()
+
+    async def _page(self, offset: int) -> list[dict]:
+        return await self.client.get_json(
+            self.path, {"offset": offset, "limit": self.page_size}
+        )
+
+    async def load_next(self) -> list[dict]:
+        """Loads the next page and returns the newly added items."""
+        async with self._lock:
+            if not self.has_more:
+                return []
+            page = await self._page(len(self.items))
+            self.items.extend(page)
+            self.has_more = len(page) == self.page_size
+            return page
+
+    async def refresh(self) -> list[dict]:
+        """Revalidates every loaded page and returns the full item list."""
+        async with self._lock:
+            loaded = max(len(self.items), self.page_size)
+            offsets = range(0, loaded, self.page_size)
+            pages = await asyncio.gather(*(self._page(offset) for offset in offsets))
+            self.items = [item for page in pages for item in page]
+            self.has_more = len(pages[-1]) == self.page_size
+            return self.items
+
+
+_api_client: Optional[ApiClient] = None
+
+
+def get_api_client() -> ApiClient:
+    """Gets or creates the shared API client."""
+    global _api_client
+    if _api_client is None:
+        _api_client = ApiClient()
+    return _api_client
+
+
+async def close_api_client():
+    global _api_client
+    if _api_client is not None:
+        await _api_client.close()
+        _api_client = None
+
+
+def user_pages_loader(page_size: int = 50) -> PagedLoader:
+    """Creates a PagedLoader over the backend's user list."""
+    return PagedLoader(get_api_client(), USERS_PATH, page_size)
@@ -0,0 +1,202 @@
+import asyncio
+
+import httpx
+
+from src.api_client import ApiClient, PagedLoader
+
+
+class FakeBackend:
+    """
+    Serves ``/users`` pages and ``/me`` with ETags, recording every request.
+    GETs arriving while ``gate`` is set wait until that event fires.
+    """
+
+    def __init__(self, users: list[dict]):
+        self.users = users
+        self.requests: list[httpx.Request] = []
+        self.gate: asyncio.Event | None = None
+
+    def etag(self, request: httpx.Request) -> str:
+        return f'"{len(self.users)}-{request.url.query.decode()}"'
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method == "POST":
+            self.users.append(httpx.Response(200, content=request.content).json())
+            return httpx.Response(201, json=self.users[-1])
+        gate = self.gate
+        if gate is not None:
+            await gate.wait()
+        if request.url.path == "/me":
+            return httpx.Response(
+                200, json={"who": request.headers.get("Authorization")}
+            )
+        etag = self.etag(request)
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        offset = int(request.url.params.get("offset", 0))
+        limit = int(request.url.params.get("limit", len(self.users)))
+        return httpx.Response(
+            200, json=self.users[offset : offset + limit], headers={"ETag": etag}
+        )
+
+    def gets(self) -> list[httpx.Request]:
+        return [request for request in self.requests if request.method == "GET"]
+
+
+def _client(backend: FakeBackend) -> ApiClient:
+    return ApiClient(base_url="http://test", transport=httpx.MockTransport(backend))
+
+
+def _users(count: int) -> list[dict]:
+    return [{"id": index} for index in range(count)]
+
+
+def test_concurrent_identical_gets_share_one_request():
+    async def scenario():
+        backend = FakeBackend(_users(3))
+        client = _client(backend)
+        results = await asyncio.gather(*(client.get_json("/users") for _ in range(5)))
+        await client.close()
+        return backend, results
+
+    backend, results = asyncio.run(scenario())
+
+    assert len(backend.gets()) == 1
+    assert all(result == _users(3) for result in results)
+
+
+def test_cached_etag_is_revalidated_and_304_returns_cached_body():
+    async def scenario():
+        backend = FakeBackend(_users(3))
+        client = _client(backend)
+        first = await client.get_json("/users")
+        second = await client.get_json("/users")
+        await client.close()
+        return backend, first, second
+
+    backend, first, second = asyncio.run(scenario())
+
+    first_request, second_request = backend.gets()
+    assert "If-None-Match" not in first_request.headers
+    assert second_request.headers["If-None-Match"] == '"3-"'
+    assert second == first == _users(3)
+
+
+def test_set_token_shares_nothing_with_the_previous_token():
+    async def scenario():
+        backend = FakeBackend([])
+        backend.gate = asyncio.Event()
+        client = _client(backend)
+        client.set_token("alice")
+        alice = asyncio.ensure_future(client.get_json("/me"))
+        await asyncio.sleep(0)
+        client.set_token("bob")
+        bob = asyncio.ensure_future(client.get_json("/me"))
+        await asyncio.sleep(0)
+        backend.gate.set()
+        results = await alice, await bob
+        cache_owners = {key[0] for key in client._cache}
+        await client.close()
+        return backend, results, cache_owners
+
+    backend, (alice, bob), cache_owners = asyncio.run(scenario())
+
+    assert len(backend.gets()) == 2
+    assert alice == {"who": "Bearer alice"}
+    assert bob == {"who": "Bearer bob"}
+    assert "Bearer alice" not in cache_owners
+
+
+def test_cancelling_one_waiter_keeps_the_shared_request():
+    async def scenario():
+        backend = FakeBackend(_users(2))
+        backend.gate = asyncio.Event()
+        client = _client(backend)
+        cancelled = asyncio.ensure_future(client.get_json("/users"))
+        kept = asyncio.ensure_future(client.get_json("/users"))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        backend.gate.set()
+        result = await kept
+        await client.close()
+        return backend, cancelled, result
+
+    backend, cancelled, result = asyncio.run(scenario())
+
+    assert cancelled.cancelled()
+    assert result == _users(2)
+    assert len(backend.gets()) == 1
+
+
+def test_paged_loader_stops_on_short_page_and_refresh_revalidates():
+    async def scenario():
+        backend = FakeBackend(_users(5))
+        client = _client(backend)
+        loader = PagedLoader(client, "/users", page_size=2)
+        pages = []
+        while loader.has_more:
+            pages.append(await loader.load_next())
+        loads = len(backend.gets())
+        items = await loader.refresh()
+        refreshes = backend.gets()[loads:]
+        await client.close()
+        return pages, loads, items, refreshes
+
+    pages, loads, items, refreshes = asyncio.run(scenario())
+
+    assert pages == [_users(5)[0:2], _users(5)[2:4], _users(5)[4:5]]
+    assert loads == 3
+    assert items == _users(5)
+    assert sorted(request.url.params["offset"] for request in refreshes) == [
+        "0",
+        "2",
+        "4",
+    ]
+    assert all("If-None-Match" in request.headers for request in refreshes)
+
+
+def test_paged_loader_stops_on_empty_page():
+    async def scenario():
+        backend = FakeBackend(_users(2))
+        client = _client(backend)
+        loader = PagedLoader(client, "/users", page_size=2)
+        first = await loader.load_next()
+        second = await loader.load_next()
+        third = await loader.load_next()
+        await client.close()
+        return loader, backend, (first, second, third)
+
+    loader, backend, (first, second, third) = asyncio.run(scenario())
+
+    assert first == _users(2)
+    assert second == third == []
+    assert not loader.has_more
+    assert len(backend.gets()) == 2
+
+
+def test_write_invalidates_cached_and_in_flight_reads():
+    async def scenario():
+        backend = FakeBackend(_users(1))
+        client = _client(backend)
+        await client.get_json("/users")
+
+        gate = backend.gate = asyncio.Event()
+        stale = asyncio.ensure_future(client.get_json("/users"))
+        await asyncio.sleep(0.01)
+        backend.gate = None
+        await client.send_json("POST", "/users", {"id": 1})
+
+        fresh = await client.get_json("/users")
+        gate.set()
+        stale_result = await stale
+        cached = [entry.data for entry in client._cache.values()]
+        await client.close()
+        return stale_result, fresh, cached
+
+    stale_result, fresh, cached = asyncio.run(scenario())
+
+    assert stale_result == _users(1)
+    assert fresh == _users(2)
+    assert cached == [_users(2)]